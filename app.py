@@ -1,90 +1,423 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, stream_with_context
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
-import json
+import atexit
+import bisect
+import orjson
 import os
+import threading
+
+class ORJSONProvider(JSONProvider):
+    """Route all of Flask's JSON handling (jsonify, request.get_json)
+    through orjson instead of stdlib json."""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
 CORS(app)  # Enable CORS for frontend-backend communication
 
 DATA_FILE = "employees.json"
 
+
+class DuplicateIDError(Exception):
+    """Raised when an employee ID is already registered."""
+
+
+class MissingFieldError(Exception):
+    """Raised when a required employee field is absent or empty."""
+
+
 class EmployeeManagementSystem:
-    def __init__(self, data_file):
+    # Every employee record must carry these non-empty fields
+    REQUIRED_FIELDS = ('id', 'name', 'department', 'salary')
+
+    # Writes within this window are coalesced into a single flush
+    _FLUSH_DELAY = 0.1
+    # Rewrite the whole file (compaction) after this many appends
+    _COMPACT_EVERY = 1000
+
+    def __init__(self, data_file, use_index=True):
         self.data_file_path = data_file
-        if not os.path.exists(self.data_file_path):
-            with open(self.data_file_path, 'w') as file:
-                json.dump([], file)
+        # use_index=False trades the per-record dict entries for a sorted
+        # ID list + binary search (O(log N) lookups, less memory)
+        self.use_index = use_index
+        # One long-lived descriptor for all data-file I/O; avoids path
+        # resolution and fd churn on every read/write (O_CREAT also gives
+        # us the empty JSONL file on first run)
+        self._fd = os.open(self.data_file_path, os.O_RDWR | os.O_CREAT, 0o644)
+        # Parse the file once at startup and serve all reads from memory,
+        # so GET requests don't pay file-open + JSON-parse cost every time
+        self._needs_compact = False
+        self._cache = self._load_data_from_disk()
+        self._cache_mtime = self._current_mtime()
+        self._rebuild_lookup()
+        # Dirty-flag + timer coalesce bursts of inserts into one file write
+        self._dirty = False
+        self._flush_lock = threading.Lock()
+        self._flush_timer = None
+        # Records added since the last flush, appended as JSONL lines
+        self._pending = []
+        self._inserts_since_compact = 0
+        # Lazily cached serialized form of the full list, plus a version
+        # counter that bumps on every change (used as an ETag upstream)
+        self._cache_bytes = None
+        self._version = 0
+        # Memoized per-ID response bytes for repeated GET-by-id traffic
+        self._record_bytes = {}
+        # atexit runs LIFO: flush any pending writes first, then close
+        atexit.register(self._close_fd)
+        atexit.register(self._flush_now)
 
-    def _load_data(self):
+    def _close_fd(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def _reopen_fd(self):
+        # Point the shared descriptor at the file currently on disk
+        # (needed after an atomic-rename compaction or external replace)
+        os.close(self._fd)
+        self._fd = os.open(self.data_file_path, os.O_RDWR | os.O_CREAT, 0o644)
+
+    def _rebuild_lookup(self):
+        cache = self._cache
+        if self.use_index:
+            # Side index for O(1) lookup by ID instead of scanning the list
+            self._by_id = {employee['id']: employee for employee in cache}
+            self._ids = None
+        else:
+            # Keep the cache sorted by ID with a parallel key list for
+            # bisect.  Sort into a fresh list and rebind last — an in-place
+            # sort empties the list for its duration, so a concurrent
+            # reader's snapshot could observe zero employees (same
+            # copy-on-write discipline as insert())
+            new_cache = sorted(cache, key=lambda employee: employee['id'])
+            new_ids = [employee['id'] for employee in new_cache]
+            self._by_id = None
+            self._cache = new_cache
+            self._ids = new_ids
+
+    def _current_mtime(self):
         try:
-            with open(self.data_file_path, 'r') as file:
-                return json.load(file)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
+            return os.stat(self.data_file_path).st_mtime
+        except OSError:
+            return None
 
-    def _save_data(self, data):
+    def _load_data_from_disk(self):
         try:
-            with open(self.data_file_path, 'w') as file:
-                json.dump(data, file, indent=4)
-            return True
-        except Exception as e:
-            return False
+            # One pread of the whole file through the shared descriptor:
+            # a single syscall, then parse in memory
+            raw = os.pread(self._fd, os.fstat(self._fd).st_size, 0)
+        except OSError:
+            return []
+        if raw[:1] == b'[':
+            # Legacy single-array file; rewritten as JSONL on next flush.
+            # A corrupt file propagates the decode error rather than
+            # loading as empty and being compacted over (flag only set
+            # once the parse has succeeded)
+            records = orjson.loads(raw)
+            self._needs_compact = True
+            return records
+        # Newline-delimited JSON: one employee record per line.  A decode
+        # failure on the *last* line is the artifact a crash mid-append
+        # leaves behind: keep the intact records and schedule a compaction
+        # so the partial tail is trimmed before anything is appended after
+        # it.  A bad line anywhere else is real corruption and propagates
+        # — never load as empty and then overwrite the file.
+        records = []
+        lines = raw.splitlines()
+        for position, line in enumerate(lines):
+            if not line.strip():
+                continue
+            try:
+                records.append(orjson.loads(line))
+            except orjson.JSONDecodeError:
+                if position == len(lines) - 1:
+                    self._needs_compact = True
+                    continue
+                raise
+        # Last occurrence of an ID wins, so a record that lands both
+        # in an append and a racing compaction is harmless
+        return list({record['id']: record for record in records}.values())
+
+    def _load_data(self):
+        # Reload from disk only if the file was modified externally;
+        # never while a flush of our own changes is still pending
+        mtime = self._current_mtime()
+        if mtime != self._cache_mtime and not self._dirty:
+            # The reload reopens and reads the shared descriptor, so it
+            # must not race another reload (double-close) or a flush
+            # (write to a closing fd).  Re-check under the lock: another
+            # thread may have already done the reload.  The common case —
+            # no external change — stays lock-free.
+            with self._flush_lock:
+                mtime = self._current_mtime()
+                if mtime != self._cache_mtime and not self._dirty:
+                    self._reopen_fd()  # the file may have been replaced
+                    self._cache = self._load_data_from_disk()
+                    self._cache_mtime = mtime
+                    self._rebuild_lookup()
+                    self._invalidate_serialized()
+        return self._cache
+
+    def _invalidate_serialized(self):
+        self._cache_bytes = None
+        self._record_bytes.clear()
+        self._version += 1
+
+    def _mark_dirty(self):
+        # Schedule a flush shortly; further writes in the window piggyback
+        with self._flush_lock:
+            self._dirty = True
+            if self._flush_timer is None or not self._flush_timer.is_alive():
+                self._flush_timer = threading.Timer(self._FLUSH_DELAY, self._flush_now)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+
+    def _flush_now(self):
+        with self._flush_lock:
+            if not self._dirty:
+                return
+            # Take the pending batch; inserts racing this flush start a
+            # fresh list and are picked up by the next one
+            pending = self._pending
+            self._pending = []
+            try:
+                if self._needs_compact or self._inserts_since_compact >= self._COMPACT_EVERY:
+                    self._compact_locked()
+                else:
+                    # Append-only: the pending records go out as one pwrite
+                    # at the current end of the shared descriptor
+                    lines = b''.join(orjson.dumps(record) + b'\n'
+                                     for record in pending)
+                    os.pwrite(self._fd, lines, os.fstat(self._fd).st_size)
+                self._dirty = False
+                self._cache_mtime = self._current_mtime()
+            except Exception as error:
+                # Report it, put the batch back, and stay dirty so the
+                # next flush (or atexit) retries
+                print(f"Error saving data: {error}")
+                self._pending = pending + self._pending
+
+    def _compact_locked(self):
+        # Rewrite the full cache as JSONL via a temp file + atomic rename,
+        # so a crash mid-write can't corrupt employees.json
+        cache = self._cache  # snapshot; covers all staged records
+        tmp_path = self.data_file_path + '.tmp'
+        with open(tmp_path, 'wb') as file:
+            for record in cache:
+                file.write(orjson.dumps(record) + b'\n')
+        os.replace(tmp_path, self.data_file_path)
+        self._reopen_fd()  # the rename left self._fd on the old inode
+        self._needs_compact = False
+        self._inserts_since_compact = 0
+
+    def insert(self, employee_data):
+        # Single pass over the record: validate, dedupe-check, stage write
+        for field in self.REQUIRED_FIELDS:
+            if field not in employee_data or not employee_data[field]:
+                raise MissingFieldError(field)
+
+        self._load_data()
+
+        # Copy-on-write: build new list/lookup objects and rebind the
+        # attributes last.  Attribute rebinding is atomic under the GIL,
+        # so concurrent readers that snapshot self._cache (and friends)
+        # into a local always see a complete, consistent version without
+        # taking any lock.
+        emp_id = employee_data['id']
+        if self._by_id is not None:
+            # O(1) duplicate check against the index
+            if emp_id in self._by_id:
+                raise DuplicateIDError(emp_id)
+            new_cache = self._cache + [employee_data]
+            new_by_id = {**self._by_id, emp_id: employee_data}
+            self._cache = new_cache
+            self._by_id = new_by_id
+        else:
+            # O(log N) duplicate check + sorted insert via bisect
+            position = bisect.bisect_left(self._ids, emp_id)
+            if position < len(self._ids) and self._ids[position] == emp_id:
+                raise DuplicateIDError(emp_id)
+            new_cache = self._cache.copy()
+            new_cache.insert(position, employee_data)
+            new_ids = self._ids.copy()
+            new_ids.insert(position, emp_id)
+            self._cache = new_cache
+            self._ids = new_ids
+        self._pending.append(employee_data)
+        self._inserts_since_compact += 1
+        self._invalidate_serialized()
+        self._mark_dirty()
+
+    def add_employees(self, records):
+        """Insert a batch of records, reporting per-record outcomes.
+
+        All accepted records land in the same debounced flush, so a batch
+        of N inserts still costs one file write."""
+        results = []
+        for record in records:
+            if not isinstance(record, dict):
+                results.append({'id': None, 'added': False,
+                                'error': 'Record must be a JSON object'})
+                continue
+            try:
+                self.insert(record)
+            except MissingFieldError as error:
+                results.append({'id': record.get('id'), 'added': False,
+                                'error': f'Missing required field: {error}'})
+            except DuplicateIDError:
+                results.append({'id': record['id'], 'added': False,
+                                'error': 'Employee ID already exists'})
+            else:
+                results.append({'id': record['id'], 'added': True})
+        return results
 
     def add_employee(self, employee_data):
-        all_employees = self._load_data()
-        
-        # Check for duplicate ID
-        for employee in all_employees:
-            if employee['id'] == employee_data['id']:
-                return False, "Employee ID already exists"
-                
-        all_employees.append(employee_data)
-        if self._save_data(all_employees):
-            return True, "Employee added successfully"
-        return False, "Error saving employee"
+        # Tuple-returning wrapper kept for callers that don't want exceptions
+        try:
+            self.insert(employee_data)
+        except MissingFieldError as error:
+            return False, f"Missing required field: {error}"
+        except DuplicateIDError:
+            return False, "Employee ID already exists"
+        return True, "Employee added successfully"
 
     def view_all_employees(self):
         return self._load_data()
 
+    def data_version(self):
+        """Counter that bumps on every change; usable as an ETag."""
+        self._load_data()
+        return self._version
+
+    def view_all_employees_bytes(self):
+        """Serialized employee list plus its version, re-encoded only
+        when the data has changed since the last call."""
+        self._load_data()
+        if self._cache_bytes is None:
+            self._cache_bytes = orjson.dumps(self._cache)
+        return self._cache_bytes, self._version
+
     def search_employee(self, emp_id):
-        all_employees = self._load_data()
-        for employee in all_employees:
-            if employee['id'] == emp_id:
-                return employee
+        self._load_data()  # refresh lookup if the file changed externally
+        by_id = self._by_id  # one snapshot read; see insert()
+        if by_id is not None:
+            return by_id.get(emp_id)
+        # Two snapshot reads can straddle a writer's swap, so verify the
+        # record and fall back to a scan of the list snapshot if torn
+        ids = self._ids
+        cache = self._cache
+        position = bisect.bisect_left(ids, emp_id)
+        if position < len(ids) and ids[position] == emp_id:
+            if position < len(cache) and cache[position]['id'] == emp_id:
+                return cache[position]
+            return next((employee for employee in cache
+                         if employee['id'] == emp_id), None)
         return None
 
+    def search_employee_bytes(self, emp_id):
+        """Serialized record for one ID, memoized until the data changes.
+
+        Returns None if no such employee exists (misses are not cached)."""
+        self._load_data()  # honor the external-edit check before the memo
+        cached = self._record_bytes.get(emp_id)
+        if cached is not None:
+            return cached
+        employee = self.search_employee(emp_id)
+        if employee is None:
+            return None
+        body = orjson.dumps(employee)
+        self._record_bytes[emp_id] = body
+        return body
+
 # Initialize the system
 system = EmployeeManagementSystem(DATA_FILE)
 
+# Above this many records, GET /api/employees streams instead of
+# buffering the whole serialized list alongside the cache
+STREAM_THRESHOLD = 1000
+
 # API Routes
 @app.route('/api/employees', methods=['GET'])
 def get_employees():
     employees = system.view_all_employees()
-    return jsonify(employees)
+    etag = f'"{system.data_version()}"'
+    if request.headers.get('If-None-Match') == etag:
+        # A 304 must still carry the validator it matched (RFC 9110)
+        response = app.response_class(status=304)
+    elif len(employees) < STREAM_THRESHOLD:
+        # Small list: serve the pre-serialized bytes in one shot
+        body, _ = system.view_all_employees_bytes()
+        response = app.response_class(body, mimetype='application/json')
+    else:
+        # Large list: emit one record at a time so peak memory stays at
+        # ~1x the payload and the client can start parsing immediately
+        def generate(snapshot=employees):
+            yield b'['
+            first = True
+            for employee in snapshot:
+                if not first:
+                    yield b','
+                first = False
+                yield orjson.dumps(employee)
+            yield b']'
+        response = app.response_class(stream_with_context(generate()),
+                                      mimetype='application/json')
+    response.headers['ETag'] = etag
+    return response
 
 @app.route('/api/employees', methods=['POST'])
 def add_employee():
-    employee_data = request.get_json()
-    
-    # Validate required fields
-    required_fields = ['id', 'name', 'department', 'salary']
-    for field in required_fields:
-        if field not in employee_data or not employee_data[field]:
-            return jsonify({'error': f'Missing required field: {field}'}), 400
-    
-    success, message = system.add_employee(employee_data)
-    if success:
-        return jsonify({'message': message}), 201
-    else:
-        return jsonify({'error': message}), 400
+    # Decode the raw body with orjson rather than request.get_json(),
+    # skipping Werkzeug's stdlib-json parse of the same bytes
+    try:
+        employee_data = orjson.loads(request.get_data())
+    except orjson.JSONDecodeError:
+        return jsonify({'error': 'Request body is not valid JSON'}), 400
+    if not isinstance(employee_data, dict):
+        return jsonify({'error': 'Request body must be a JSON object'}), 400
+
+    # Validation lives in insert(); map its exceptions to HTTP codes
+    try:
+        system.insert(employee_data)
+    except MissingFieldError as error:
+        return jsonify({'error': f'Missing required field: {error}'}), 400
+    except DuplicateIDError:
+        return jsonify({'error': 'Employee ID already exists'}), 400
+    return jsonify({'message': 'Employee added successfully'}), 201
+
+@app.route('/api/employees/bulk', methods=['POST'])
+def add_employees_bulk():
+    # One request, one load, one flush for a whole batch of inserts
+    try:
+        records = orjson.loads(request.get_data())
+    except orjson.JSONDecodeError:
+        return jsonify({'error': 'Request body is not valid JSON'}), 400
+    if not isinstance(records, list):
+        return jsonify({'error': 'Request body must be a JSON array'}), 400
+    return jsonify(system.add_employees(records)), 200
+
 
 @app.route('/api/employees/<emp_id>', methods=['GET'])
 def get_employee(emp_id):
-    employee = system.search_employee(emp_id)
-    if employee:
-        return jsonify(employee)
-    else:
+    body = system.search_employee_bytes(emp_id)
+    if body is None:
         return jsonify({'error': 'Employee not found'}), 404
+    return app.response_class(body, mimetype='application/json')
 
+# Run directly only for local development (set DEV=1 for the reloader/debugger).
+# In production serve threaded instead of the single-threaded Werkzeug dev
+# server:  gunicorn -w 1 -k gthread app:app
+# Exactly one worker process: the storage layer is single-writer by design
+# (per-process cache, append offsets taken from fstat), so concurrency comes
+# from threads — which the lock-free snapshot reads are built for — not from
+# multiple processes appending to the same file.
 if __name__ == '__main__':
-    app.run(debug=True, port=5000)
\ No newline at end of file
+    app.run(debug=os.environ.get('DEV') == '1', port=5000)
\ No newline at end of file
@@ -85,17 +85,27 @@ class EmployeeManagementSystem:
 
     def _load_data(self):
         """
-        Private method to load all employee data from JSON file.
-        
+        Private method to load all employee data from the data file.
+
+        Handles both storage formats: the legacy JSON array and the
+        newline-delimited JSON (JSONL) written by the API layer.
+
         Returns:
-            list: List of employee dictionaries, empty list if file error
+            list: List of employee dictionaries, empty list if no file
         """
         try:
             with open(self.data_file_path, 'r') as file:
-                return json.load(file)
-        except (FileNotFoundError, json.JSONDecodeError):
-            # Return empty list if file doesn't exist or is corrupted
+                raw = file.read()
+        except FileNotFoundError:
+            return []
+        if not raw.strip():
             return []
+        # A corrupted file is an error, not an empty system: returning []
+        # here would let the next save overwrite it and lose every record,
+        # so decode failures are allowed to propagate
+        if raw.lstrip().startswith('['):
+            return json.loads(raw)
+        return [json.loads(line) for line in raw.splitlines() if line.strip()]
 
     def _save_data(self, data):
         """
@@ -109,7 +119,9 @@ class EmployeeManagementSystem:
         """
         try:
             with open(self.data_file_path, 'w') as file:
-                json.dump(data, file, indent=4)  # indent=4 for readable formatting
+                # Compact separators: the file is machine-read, and pretty
+                # printing makes the encoder noticeably slower
+                json.dump(data, file, separators=(',', ':'))
             return True
         except Exception as e:
             print(f"Error saving data: {e}")
@@ -126,13 +138,12 @@ class EmployeeManagementSystem:
             bool: True if employee added, False if duplicate ID or save error
         """
         all_employees = self._load_data()
-        
-        # Check for duplicate employee ID
-        for employee in all_employees:
-            if employee['id'] == employee_data['id']:
-                print("Error: An employee with this ID already exists.")
-                return False
-                
+
+        # Check for duplicate employee ID (any() iterates at C speed)
+        if any(employee['id'] == employee_data['id'] for employee in all_employees):
+            print("Error: An employee with this ID already exists.")
+            return False
+
         # Add new employee and save
         all_employees.append(employee_data)
         return self._save_data(all_employees)
@@ -157,10 +168,9 @@ class EmployeeManagementSystem:
             dict: Employee data if found, None if not found
         """
         all_employees = self._load_data()
-        for employee in all_employees:
-            if employee['id'] == emp_id:
-                return employee
-        return None
+        # next() over a generator keeps the scan loop in C code
+        return next((employee for employee in all_employees
+                     if employee['id'] == emp_id), None)
 
 
 def add_employee_workflow(system):